@@ -12,21 +12,86 @@ Usage example:
     --content "article.reader" \
     --max 20 \
     --out downloads \
+    --parallel 2 \
     --dry-run --dump-html --screenshot
 
 If a site needs login, run the GUI app locally to sign in and export a
 Playwright storage state JSON, then reuse it here via --storage-state state.json.
+
+Server-rendered sites: add --http-first (needs `pip install httpx selectolax`)
+to read chapters from plain HTTP responses, falling back to the browser only
+when the content selector is missing from the raw HTML.
+
+Repeated runs (Unix): start `python cli_runner.py --serve` once, then add
+--connect to the usual command to reuse its browser instead of launching one.
 """
 
 import argparse
+import asyncio
+import io
+import json
 import os
 import re
+import shutil
+import stat
 import sys
-import time
-import random
+import tempfile
+from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+
+try:  # optional: only needed for --http-first
+    import httpx
+    try:
+        from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    except ImportError:  # selectolax < 0.3.13 only ships the Modest backend
+        from selectolax.parser import HTMLParser
+except ImportError:
+    httpx = HTMLParser = None
+
+ABSOLUTE_PREFIXES = ("http://", "https://")
+GOLDEN_RATIO_CONJ = 0.6180339887498949
+LOG_FLUSH_EVERY = 8          # log lines buffered before writing to stdout
+TOC_SETTLE_MS = 500          # default extra wait after the TOC loads
+MAX_PARALLEL = 2             # workers; each one paces itself with the delay schedule
+COPY_BUFFER = 1 << 20        # chunk size when assembling combined.txt
+CHAPTER_SEPARATOR = "\n" + ("-" * 80) + "\n\n"
+SOCKET_NAME = "toc.sock"     # inside $XDG_RUNTIME_DIR, else <tmp>/toc-extractor-<uid>/
+JOB_FIELDS = ("toc", "link", "title", "content")  # required per job (CLI or --serve)
+STATIC_BLOCKS = "p, h1, h2, h3, h4, h5, h6, li, blockquote"  # one line each on the --http-first path
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_HOSTS = (
+    "doubleclick.net",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "googlesyndication.com",
+    "facebook.net",
+    "scorecardresearch.com",
+)
+
+# Title + content in one round trip; missing elements come back as null.
+EXTRACT_JS = """([ts, cs]) => {
+  const t = document.querySelector(ts);
+  const c = document.querySelector(cs);
+  return {title: t ? t.innerText : null, body: c ? c.innerText : null};
+}"""
+
+# Truthy once the selector matches an element with visible text (JS-filled containers).
+HAS_TEXT_JS = """sel => {
+  const el = document.querySelector(sel);
+  return !!el && el.innerText.trim().length > 0;
+}"""
+
+# Unique hrefs in document order, capped in-page so only what we fetch crosses CDP.
+LINKS_JS = """([sel, cap]) => {
+  const out = []; const seen = new Set();
+  for (const a of document.querySelectorAll(sel)) {
+    const h = a.href || a.getAttribute('href');
+    if (h && !seen.has(h)) { seen.add(h); out.push(h); if (out.length >= cap) break; }
+  }
+  return out;
+}"""
 
 
 # ------------------ Utilities ------------------ #
@@ -39,39 +104,224 @@ def is_valid_url(u: str) -> bool:
         return False
 
 
+_FN_CTRL = str.maketrans(dict.fromkeys("\t\n\r", " "))  # control chars → space
+_FN_BAD = re.compile(r'[\\/:*?"<>|]+')  # a run of path-hostile chars → one "_"
+_FN_WS = re.compile(r"\s+")
+_AD_RE = re.compile(r"Ads by\s+\w+|Sponsored\s+Content", re.IGNORECASE)
+_URL_RE = re.compile(r"https?://\S+")
+# Any whitespace run containing a newline collapses to a single "\n"
+_WS_NL = re.compile(r"\s*\n\s*")
+
+
 def safe_filename(name: str) -> str:
-    name = re.sub(r"[\t\n\r]", " ", name).strip()
-    name = re.sub(r'[\\/:*?"<>|]+', "_", name)
-    name = re.sub(r"\s+", " ", name)
+    name = name.translate(_FN_CTRL).strip()
+    name = _FN_BAD.sub("_", name)
+    name = _FN_WS.sub(" ", name)
     return (name or "untitled")[:150]
 
 
 def clean_text(text: str, remove_links: bool = True, strip_ads: bool = True) -> str:
     if strip_ads:
-        for pat in (r"Ads by\s+\w+", r"Sponsored\s+Content"):
-            text = re.sub(pat, "", text, flags=re.IGNORECASE)
+        text = _AD_RE.sub("", text)
     if remove_links:
-        text = re.sub(r"https?://\S+", "", text)
-    text = re.sub(r"\s+\n", "\n", text)
-    text = re.sub(r"\n\s+", "\n", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+        text = _URL_RE.sub("", text)
+    text = _WS_NL.sub("\n", text)
     return text.strip()
 
 
-def sleep_polite(min_s: float, max_s: float):
-    delay = max(0.0, random.uniform(min_s, max_s))
-    if delay:
-        time.sleep(delay)
+def is_blocked_host(host: str, deny) -> bool:
+    return any(host == d or host.endswith("." + d) for d in deny)
+
+
+async def install_blocker(context, deny_hosts):
+    """Abort sub-resources the text extractor never needs (images, fonts, trackers…)."""
+    async def handle(route):
+        req = route.request
+        if (req.resource_type in BLOCKED_RESOURCE_TYPES
+                or is_blocked_host(urlparse(req.url).hostname or "", deny_hosts)):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle)
+
+
+def chapter_payload(title: str, url: str, text: str, include_links: bool) -> str:
+    source = f"Source: {url}\n\n" if include_links else ""
+    return f"{title}\n\n{source}{text}\n"
+
+
+def delay_schedule(n: int, min_s: float, max_s: float) -> list:
+    """Per-chapter delays spread over [min_s, max_s] by golden-ratio jitter.
+
+    Deterministic, so pacing is reproducible when debugging site throttling.
+    """
+    span = max_s - min_s
+    return [min_s + ((i * GOLDEN_RATIO_CONJ) % 1.0) * span for i in range(1, n + 1)]
+
+
+def concat_chapters(paths, combined_path: str):
+    """Build combined.txt from the chapter files already on disk (page-cache reads)."""
+    sep = CHAPTER_SEPARATOR.replace("\n", os.linesep).encode("utf-8")  # match text-mode files
+    with open(combined_path, "wb") as out:
+        for p in paths:
+            with open(p, "rb") as src:
+                shutil.copyfileobj(src, out, COPY_BUFFER)
+            out.write(sep)
+
+
+async def sleep_polite(delay: float):
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+class BufferedLog:
+    """Log sink that collects lines and writes them to stdout every ``every`` lines."""
+
+    def __init__(self, every: int = LOG_FLUSH_EVERY):
+        self._buf = io.StringIO()
+        self._pending = 0
+        self._every = every
+
+    def __call__(self, line: str):
+        self._buf.write(line + "\n")
+        self._pending += 1
+        if self._pending >= self._every:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            sys.stdout.write(self._buf.getvalue())
+            sys.stdout.flush()
+            self._buf.seek(0)
+            self._buf.truncate()
+            self._pending = 0
+
+
+# ------------------ Static fast path ------------------ #
+
+def http_client(args, max_connections: int):
+    """httpx client mirroring the browser context's UA and stored cookies."""
+    headers = {"user-agent": args.ua} if args.ua else None
+    cookies = httpx.Cookies()
+    if args.storage_state:
+        # Parsed before the client exists, so a malformed file can't leak one
+        with open(args.storage_state, encoding="utf-8") as f:
+            for c in json.load(f).get("cookies", []):
+                cookies.set(c["name"], c["value"], domain=c.get("domain", ""), path=c.get("path", "/"))
+    return httpx.AsyncClient(
+        headers=headers,
+        cookies=cookies,
+        follow_redirects=True,
+        timeout=args.timeout / 1000,
+        limits=httpx.Limits(max_connections=max_connections),
+    )
+
+
+def static_text(content):
+    """innerText-like text of a parsed container: one line per block, ``<br>`` kept.
+
+    Inline markup and source line-wrapping stay inside their line. Returns None
+    when the blocks don't account for all of the container's text (loose text,
+    nested blocks, ``<pre>``…), so the caller can defer to the browser.
+
+    >>> from selectolax.lexbor import LexborHTMLParser
+    >>> html = ("<div><p>Hello <em>world</em>, this is a\\nwrapped line with a <a>link</a>.</p>"
+    ...         "<p>Second<br>para.</p></div>")
+    >>> static_text(LexborHTMLParser(html).css_first("div"))
+    'Hello world, this is a wrapped line with a link.\\nSecond\\npara.'
+    """
+    lines = []
+    for block in content.css(STATIC_BLOCKS):
+        parts = [""]
+        for node in block.traverse(include_text=True):
+            if node.tag == "-text":
+                parts[-1] += node.text_content
+            elif node.tag == "br":
+                parts.append("")
+        lines.extend(" ".join(p.split()) for p in parts)
+    text = "\n".join(line for line in lines if line)
+    if "".join(text.split()) != "".join(content.text().split()):
+        return None
+    return text
+
+
+async def fetch_static(client, url: str, title_sel: str, content_sel: str):
+    """(title, body) from the raw HTML, or None when the page needs a browser."""
+    try:
+        r = await client.get(url)
+        r.raise_for_status()
+        if "html" not in r.headers.get("content-type", ""):
+            return None
+        tree = HTMLParser(r.text)
+        tree.strip_tags(["script", "style"])
+        content = tree.css_first(content_sel)
+        if content is None:
+            return None
+        body = static_text(content)
+        if not body:
+            return None  # JS-filled container, or markup too loose to mirror innerText
+        title = tree.css_first(title_sel)
+        return (title.text() if title else None), body
+    except Exception:
+        return None  # network, parse or selector trouble: let the browser handle it
+
+
+# ------------------ Page objects ------------------ #
+
+class ChapterPage:
+    """One worker's chapter page: selectors are bound once, reused for every URL."""
+
+    def __init__(self, page, title_sel: str, content_sel: str, timeout: int, settle_ms: int = 0):
+        self.page = page
+        self._selectors = [title_sel, content_sel]
+        self._content_sel = content_sel
+        self._timeout = timeout
+        self._settle = settle_ms / 1000
+        self._dirty = False
+
+    async def load(self, url: str):
+        self._dirty = True
+        try:
+            await self.page.goto(url, wait_until="commit")
+        except PWTimeout:
+            pass  # commit may fire late; the content wait gates correctness
+        # Attached isn't enough: some sites fill the container after DOMContentLoaded
+        await self.page.wait_for_function(HAS_TEXT_JS, arg=self._content_sel,
+                                          polling=100, timeout=self._timeout)
+        # Parsing may still be streaming the element's children
+        await self.page.wait_for_load_state("domcontentloaded")
+        if self._settle:
+            await asyncio.sleep(self._settle)
+
+    async def extract(self) -> tuple:
+        """(title, body); either may be None when its element is missing."""
+        data = await self.page.evaluate(EXTRACT_JS, self._selectors)
+        return data["title"], data["body"]
+
+    async def reset(self):
+        """Drop DOM/JS state but keep the context warm for the next URL."""
+        if not self._dirty:
+            return  # page untouched (e.g. served by the static fast path)
+        self._dirty = False
+        try:
+            await self.page.goto("about:blank")
+        except Exception:
+            pass
 
 
 # ------------------ Main ------------------ #
 
-def main():
+class ExtractError(Exception):
+    """A run cannot continue (bad TOC, no links…); message is user-facing."""
+
+
+def build_parser() -> argparse.ArgumentParser:
     ap = argparse.ArgumentParser(description="Headless TOC extractor using Playwright.")
-    ap.add_argument("--toc", required=True, help="TOC URL (must start with http/https)")
-    ap.add_argument("--link", required=True, help="CSS selector for chapter links on the TOC page")
-    ap.add_argument("--title", required=True, help="CSS selector for title on a chapter page")
-    ap.add_argument("--content", required=True, help="CSS selector for content on a chapter page")
+    ap.add_argument("--toc", help="TOC URL (must start with http/https)")
+    ap.add_argument("--link", help="CSS selector for chapter links on the TOC page")
+    ap.add_argument("--title", help="CSS selector for title on a chapter page")
+    ap.add_argument("--content", help="CSS selector for content on a chapter page")
     ap.add_argument("--max", type=int, default=20, help="Max chapters to fetch (default: 20)")
     ap.add_argument("--out", default="downloads", help="Output folder (default: downloads)")
 
@@ -89,131 +339,367 @@ def main():
     ap.add_argument("--storage-state", default=None, help="Path to Playwright storage state JSON (reuses login)")
     ap.add_argument("--headful", action="store_true", help="Run headed (GUI). Default is headless.")
     ap.add_argument("--timeout", type=int, default=25000, help="Navigation timeout ms (default: 25000)")
+    ap.add_argument("--parallel", type=int, default=MAX_PARALLEL,
+                    help=f"Chapters fetched concurrently, one context each (default: {MAX_PARALLEL}). "
+                         "Delays apply per worker, so the site sees about N requests per delay; use 1 for strict pacing")
+    ap.add_argument("--block-resources", action=argparse.BooleanOptionalAction, default=True,
+                    help="Skip images/fonts/media/CSS and known trackers on chapter pages (default: on; TOC is never filtered)")
+    ap.add_argument("--block-hosts", default="",
+                    help="Extra comma-separated hosts to block on chapter pages (e.g. ads.example.com)")
+    ap.add_argument("--http-first", action="store_true",
+                    help="Try plain HTTP (httpx + selectolax) per chapter; use the browser only if the content selector is missing")
 
     # Politeness & resilience
-    ap.add_argument("--min-delay", type=float, default=1.2, help="Min delay between chapters (s)")
-    ap.add_argument("--max-delay", type=float, default=2.5, help="Max delay between chapters (s)")
+    ap.add_argument("--min-delay", type=float, default=1.2, help="Min delay between a worker's chapters (s)")
+    ap.add_argument("--max-delay", type=float, default=2.5, help="Max delay between a worker's chapters (s)")
     ap.add_argument("--retries", type=int, default=2, help="Retries per chapter on errors (default: 2)")
-    ap.add_argument("--wait-after-load", type=int, default=500, help="Extra settle wait per page (ms)")
+    ap.add_argument("--wait-after-load", type=int, default=None,
+                    help=f"Extra settle wait per page (ms). Default: {TOC_SETTLE_MS} on the TOC, 0 on chapters "
+                         "(they already wait until the content selector has text)")
+
+    # Long-lived browser (Unix only)
+    ap.add_argument("--serve", action="store_true",
+                    help="Keep one browser running and accept jobs on --socket (skips launch cost per run)")
+    ap.add_argument("--connect", action="store_true", help="Send this job to a running --serve instance")
+    ap.add_argument("--socket", default=None,
+                    help=f"Unix socket path (default: $XDG_RUNTIME_DIR/{SOCKET_NAME}, "
+                         f"else a private <tmp>/toc-extractor-<uid>/{SOCKET_NAME})")
+    return ap
+
+
+def main():
+    ap = build_parser()
     args = ap.parse_args()
 
-    # Validate URL and create out dir
+    if args.serve:
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            print("[SERVE] Stopped.")
+        except ExtractError as e:
+            sys.exit(f"[ERROR] {e}")
+        return
+
+    missing = [f"--{f}" for f in JOB_FIELDS if not getattr(args, f)]
+    if missing:
+        ap.error("the following arguments are required: " + ", ".join(missing))
+
+    # Validate URL
     if not is_valid_url(args.toc):
         sys.exit(f"[ERROR] Invalid --toc URL: {args.toc}")
 
-    os.makedirs(args.out, exist_ok=True)
+    try:
+        asyncio.run(connect(args) if args.connect else run(args))
+    except ExtractError as e:
+        sys.exit(f"[ERROR] {e}")
+
+
+async def run(args):
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=not args.headful)
+        log = BufferedLog()
+        try:
+            await extract(browser, args, log)
+        finally:
+            log.flush()
+            await browser.close()
 
+
+async def extract(browser, args, log) -> list:
+    """Run one TOC job on an already-launched browser; returns chapter file paths.
+
+    ``log`` receives each progress line. Raises ExtractError when the job
+    cannot proceed.
+    """
     # Normalize options
     min_d = max(0.0, args.min_delay)
     max_d = max(min_d, args.max_delay)
     strip_ads = not args.no_strip_ads
 
-    with sync_playwright() as pw:
-        browser = pw.chromium.launch(headless=not args.headful)
-        context_kwargs = {}
-        if args.ua:
-            context_kwargs["user_agent"] = args.ua
-        if args.storage_state:
-            if not os.path.exists(args.storage_state):
-                sys.exit(f"[ERROR] storage-state file not found: {args.storage_state}")
-            context_kwargs["storage_state"] = args.storage_state
-
-        context = browser.new_context(**context_kwargs)
-        page = context.new_page()
+    os.makedirs(args.out, exist_ok=True)
+
+    if args.http_first and httpx is None:
+        raise ExtractError("--http-first needs optional packages: pip install httpx selectolax")
+
+    # One shared browser; each worker gets its own (cheap) context.
+    context_kwargs = {}
+    if args.ua:
+        context_kwargs["user_agent"] = args.ua
+    if args.storage_state:
+        if not os.path.exists(args.storage_state):
+            raise ExtractError(f"storage-state file not found: {args.storage_state}")
+        context_kwargs["storage_state"] = args.storage_state
+
+    context = await browser.new_context(**context_kwargs)
+    try:
+        page = await context.new_page()
         page.set_default_navigation_timeout(args.timeout)
 
         # ---------- Load TOC ---------- #
         try:
-            page.goto(args.toc, wait_until="domcontentloaded")
-            if args.wait_after_load:
-                page.wait_for_timeout(args.wait_after_load)
+            await page.goto(args.toc, wait_until="domcontentloaded")
+            toc_settle = TOC_SETTLE_MS if args.wait_after_load is None else args.wait_after_load
+            if toc_settle:
+                await asyncio.sleep(toc_settle / 1000)
         except PWTimeout:
-            browser.close()
-            sys.exit("[ERROR] Timeout while loading TOC page.")
+            raise ExtractError("Timeout while loading TOC page.")
         except Exception as e:
-            browser.close()
-            sys.exit(f"[ERROR] Failed to load TOC: {e}")
+            raise ExtractError(f"Failed to load TOC: {e}")
 
         # Debug artifacts
         if args.dump_html:
-            open(os.path.join(args.out, "toc.html"), "w", encoding="utf-8").write(page.content())
+            open(os.path.join(args.out, "toc.html"), "w", encoding="utf-8").write(await page.content())
         if args.screenshot:
-            page.screenshot(path=os.path.join(args.out, "toc.png"), full_page=True)
+            await page.screenshot(path=os.path.join(args.out, "toc.png"), full_page=True)
 
         # Collect chapter links
-        links = page.eval_on_selector_all(
-            args.link,
-            "els => els.map(a => a.href || a.getAttribute('href'))"
-        ) or []
-        links = [l for l in links if l]
-        if not links:
-            browser.close()
-            sys.exit("[ERROR] No links found with the provided --link selector. "
-                     "Inspect downloads/toc.html or use --screenshot to refine the selector.")
-
-        base = f"{urlparse(args.toc).scheme}://{urlparse(args.toc).netloc}"
-        links = [l if l.startswith("http") else urljoin(base, l) for l in links]
-        links = links[: max(1, args.max)]
-
-        if args.dry_run:
-            print("[DRY RUN] Will fetch these URLs:")
-            for i, u in enumerate(links, 1):
-                print(f"{i:03d}  {u}")
-            browser.close()
-            return
-
-        # ---------- Extract chapters ---------- #
-        combined_path = os.path.join(args.out, "combined.txt")
-        with open(combined_path, "w", encoding="utf-8") as combo:
-            for i, url in enumerate(links, 1):
-                attempt = 0
-                while True:
-                    attempt += 1
-                    try:
-                        page.goto(url, wait_until="domcontentloaded")
-                        if args.wait_after_load:
-                            page.wait_for_timeout(args.wait_after_load)
+        links = await page.evaluate(LINKS_JS, [args.link, max(1, args.max)]) or []
+    finally:
+        await context.close()
+
+    if not links:
+        raise ExtractError("No links found with the provided --link selector. "
+                           "Inspect downloads/toc.html or use --screenshot to refine the selector.")
+
+    toc = urlparse(args.toc)
+    base = f"{toc.scheme}://{toc.netloc}"
+    links = [l if l.startswith(ABSOLUTE_PREFIXES) else urljoin(base, l) for l in links]
+
+    if args.dry_run:
+        log("[DRY RUN] Will fetch these URLs:")
+        for i, u in enumerate(links, 1):
+            log(f"{i:03d}  {u}")
+        return []
+
+    # ---------- Extract chapters ---------- #
+    combined_path = os.path.join(args.out, "combined.txt")
+    results = asyncio.Queue()
+    queue = asyncio.Queue()
+
+    # Warm pool: each worker owns one context + page for the whole run.
+    n_workers = max(1, min(args.parallel, len(links)))
+    deny_hosts = BLOCKED_HOSTS + tuple(h.strip().lower() for h in args.block_hosts.split(",") if h.strip())
+    pool = []
+    pages = []
+    client = writer = None
+
+    delays = delay_schedule(len(links), min_d, max_d)
+    for i, url in enumerate(links, 1):
+        queue.put_nowait((url, i))
+    for _ in range(n_workers):
+        queue.put_nowait(None)  # one sentinel per worker
+
+    async def worker(chapter: ChapterPage):
+        while (item := await queue.get()) is not None:
+            url, i = item
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    static = await fetch_static(client, url, args.title, args.content) if client else None
+                    if static:
+                        title, body = static
+                    else:
+                        await chapter.load(url)
 
                         # Title & content
-                        title = page.eval_on_selector(args.title, "el => el.innerText") or f"chapter_{i}"
-                        body = page.eval_on_selector(args.content, "el => el.innerText") or ""
-                        title = safe_filename(title)
-                        text = clean_text(body, remove_links=not args.include_links, strip_ads=strip_ads)
-
-                        # Write files
-                        p = os.path.join(args.out, f"{i:03d} - {title}.txt")
-                        with open(p, "w", encoding="utf-8") as f:
-                            f.write(title + "\n\n")
-                            if args.include_links:
-                                f.write(f"Source: {url}\n\n")
-                            f.write(text + "\n")
-
-                        combo.write(title + "\n\n")
-                        if args.include_links:
-                            combo.write(f"Source: {url}\n\n")
-                        combo.write(text + "\n\n" + ("-" * 80) + "\n\n")
-
-                        print(f"[OK] {p}")
-                        break  # success; move to next link
-
-                    except PWTimeout:
-                        msg = f"[WARN] Timeout on {url}"
-                    except Exception as e:
-                        msg = f"[WARN] Error on {url}: {e}"
-
-                    if attempt <= args.retries:
-                        print(msg + f" — retry {attempt}/{args.retries}")
-                        sleep_polite(min_d, max_d)
-                        continue
-                    else:
-                        print(msg + " — giving up.")
-                        break
+                        title, body = await chapter.extract()
+                    if not body or not body.strip():
+                        log(f"[SKIP] empty body {url}")
+                        await results.put((i, url, None, None))
+                        break  # nothing to write; don't retry either
+                    title = safe_filename(title or f"chapter_{i}")
+                    text = clean_text(body, remove_links=not args.include_links, strip_ads=strip_ads)
+
+                    await results.put((i, url, title, text))
+                    break  # success; move to next link
+
+                except PWTimeout:
+                    msg = f"[WARN] Timeout on {url}"
+                except Exception as e:
+                    msg = f"[WARN] Error on {url}: {e}"
+
+                if attempt <= args.retries:
+                    log(msg + f" — retry {attempt}/{args.retries}")
+                    await sleep_polite(delays[i - 1])
+                    continue
+                else:
+                    log(msg + " — giving up.")
+                    await results.put((i, url, None, None))
+                    break
+
+            await chapter.reset()
+
+            # polite pacing between chapters
+            await sleep_polite(delays[i - 1])
+
+    # Everything that holds browser/network resources is created inside the
+    # guard: under --serve the browser outlives this job, so nothing may leak.
+    try:
+        for _ in range(n_workers):
+            ctx = await browser.new_context(**context_kwargs)
+            pool.append(ctx)
+            if args.block_resources:
+                await install_blocker(ctx, deny_hosts)
+            page = await ctx.new_page()
+            page.set_default_navigation_timeout(args.timeout)
+            pages.append(page)
+        if args.http_first:
+            client = http_client(args, n_workers)
+
+        writer = asyncio.create_task(write_results(results, args.out, args.include_links, log))
+        await asyncio.gather(*(worker(ChapterPage(page, args.title, args.content, args.timeout,
+                                                  args.wait_after_load or 0))
+                               for page in pages))
+    except BaseException:
+        if writer:
+            writer.cancel()
+        raise
+    finally:
+        if client:
+            await client.aclose()
+        for ctx in pool:
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+    await results.put(None)
+    paths = await writer
+    await asyncio.to_thread(concat_chapters, paths, combined_path)
+
+    log(f"[DONE] Combined: {combined_path}")
+    return paths
+
+
+async def write_results(results: asyncio.Queue, out_dir: str, include_links: bool, log) -> list:
+    """Single writer: consumes (i, url, title, text); returns chapter paths in order.
+
+    Disk I/O runs in a worker thread so the event loop keeps driving page loads.
+    """
+    written = []
+    while (item := await results.get()) is not None:
+        i, url, title, text = item
+        if title is None:
+            continue  # chapter failed or skipped
+
+        # One write per chapter file
+        payload = chapter_payload(title, url, text, include_links)
+        p = os.path.join(out_dir, f"{i:03d} - {title}.txt")
+        try:
+            await asyncio.to_thread(Path(p).write_text, payload, encoding="utf-8")
+        except Exception as e:
+            log(f"[WARN] Failed to write {p}: {e}")
+            continue
+        written.append((i, p))
+
+        log(f"[OK] {p}")
+    return [p for _, p in sorted(written)]
+
+
+# ------------------ Serve / Connect ------------------ #
+
+def job_args(request: dict) -> argparse.Namespace:
+    """CLI defaults overlaid with the fields of one JSON job request."""
+    args = build_parser().parse_args([])
+    for key, value in request.items():
+        if key in ("serve", "connect", "socket") or not hasattr(args, key):
+            continue
+        setattr(args, key, value)
+    missing = [f for f in JOB_FIELDS if not getattr(args, f)]
+    if missing:
+        raise ExtractError("Missing job fields: " + ", ".join(missing))
+    if not is_valid_url(args.toc):
+        raise ExtractError(f"Invalid toc URL: {args.toc}")
+    return args
+
+
+def socket_path(args, create: bool = False) -> str:
+    """--socket, or a per-user default that no other local user can pre-create.
+
+    The default's directory must be ours and mode 0700; otherwise a job (with
+    its absolute output/storage-state paths) could be handed to someone
+    else's listener.
+    """
+    if args.socket:
+        return args.socket
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    folder = runtime or os.path.join(tempfile.gettempdir(), f"toc-extractor-{os.getuid()}")
+    if create and not runtime:
+        os.makedirs(folder, mode=0o700, exist_ok=True)
+    try:
+        st = os.lstat(folder)
+    except FileNotFoundError:
+        raise ExtractError(f"Socket directory {folder} does not exist (is a --serve instance running?)")
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise ExtractError(f"Refusing socket directory {folder}: it must be a directory "
+                           "owned by you with mode 0700")
+    return os.path.join(folder, SOCKET_NAME)
+
+
+async def serve(args):
+    """Keep one browser alive and run JSON-line jobs from a Unix socket.
+
+    Each connection sends one job (the CLI options as a JSON object) and
+    receives ``{"log": ...}`` lines followed by ``{"done": true, "paths": [...]}``
+    or ``{"error": ...}``.
+    """
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=not args.headful)
+
+        async def handle(reader, writer):
+            def send(obj):
+                writer.write((json.dumps(obj) + "\n").encode("utf-8"))
+
+            try:
+                job = job_args(json.loads(await reader.readline()))
+                paths = await extract(browser, job, lambda line: send({"log": line}))
+                send({"done": True, "paths": paths})
+            except ExtractError as e:
+                send({"error": str(e)})
+            except Exception as e:
+                send({"error": f"{type(e).__name__}: {e}"})
+            finally:
+                try:
+                    await writer.drain()
+                finally:
+                    writer.close()
+
+        path = socket_path(args, create=True)
+        server = await asyncio.start_unix_server(handle, path=path)
+        print(f"[SERVE] Listening on {path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await browser.close()
 
-                # polite pacing between chapters
-                sleep_polite(min_d, max_d)
 
-        browser.close()
-        print(f"[DONE] Combined: {combined_path}")
+async def connect(args):
+    """Client side of --serve: submit this job and stream its log."""
+    job = {k: v for k, v in vars(args).items() if k not in ("serve", "connect", "socket")}
+    # The server may run from another working directory
+    job["out"] = os.path.abspath(args.out)
+    if args.storage_state:
+        job["storage_state"] = os.path.abspath(args.storage_state)
+
+    path = socket_path(args)
+    try:
+        reader, writer = await asyncio.open_unix_connection(path)
+    except OSError as e:
+        raise ExtractError(f"Cannot reach server on {path}: {e}")
+    log = BufferedLog()
+    try:
+        writer.write((json.dumps(job) + "\n").encode("utf-8"))
+        await writer.drain()
+        while line := await reader.readline():
+            msg = json.loads(line)
+            if "log" in msg:
+                log(msg["log"])
+            elif "error" in msg:
+                raise ExtractError(msg["error"])
+    finally:
+        log.flush()
+        writer.close()
 
 
 if __name__ == "__main__":
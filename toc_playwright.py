@@ -21,11 +21,13 @@ website's Terms of Service and your local laws. Check robots.txt where applicabl
 """
 
 import os
+import queue
 import re
+import shutil
 import time
-import random
 import threading
 import tkinter as tk
+from pathlib import Path
 from tkinter import ttk, messagebox, filedialog
 from urllib.parse import urljoin, urlparse
 
@@ -38,38 +40,96 @@ ALLOWED_COUNTS = [20, 25, 50, 100]
 DEFAULT_COUNT = 20
 DEFAULT_MIN_DELAY = 1.2
 DEFAULT_MAX_DELAY = 2.5
+ABSOLUTE_PREFIXES = ("http://", "https://")
+GOLDEN_RATIO_CONJ = 0.6180339887498949
+UI_PUMP_MS = 100             # button/log panel refresh interval
+COPY_BUFFER = 1 << 20        # chunk size when assembling combined.txt
+CHAPTER_SEPARATOR = "\n" + ("-" * 80) + "\n\n"
+
+# Title + content in one round trip; missing elements come back as null.
+EXTRACT_JS = """([ts, cs]) => {
+  const t = document.querySelector(ts);
+  const c = document.querySelector(cs);
+  return {title: t ? t.innerText : null, body: c ? c.innerText : null};
+}"""
+
+# Truthy once the selector matches an element with visible text (JS-filled containers).
+HAS_TEXT_JS = """sel => {
+  const el = document.querySelector(sel);
+  return !!el && el.innerText.trim().length > 0;
+}"""
+
+# Unique hrefs in document order, capped in-page so only what we fetch crosses CDP.
+LINKS_JS = """([sel, cap]) => {
+  const out = []; const seen = new Set();
+  for (const a of document.querySelectorAll(sel)) {
+    const h = a.href || a.getAttribute('href');
+    if (h && !seen.has(h)) { seen.add(h); out.push(h); if (out.length >= cap) break; }
+  }
+  return out;
+}"""
 
 # -------------------------- Helpers --------------------------
 
+# Control chars → space, path-hostile chars → "_", in one C-level pass
+_FN_TRANS = str.maketrans({**dict.fromkeys("\t\n\r", " "), **dict.fromkeys('\\/:*?"<>|', "_")})
+_FN_WS = re.compile(r"\s+")
+
+# Common ad markers you may extend as needed (one alternation, one scan)
+_AD_RE = re.compile(
+    r"Ads by\s+\w+"      # generic: "Ads by PubRev" etc.
+    r"|Sponsored\s+Content",
+    re.IGNORECASE,
+)
+_URL_RE = re.compile(r"https?://\S+")
+# Any whitespace run containing a newline collapses to a single "\n"
+_WS_NL = re.compile(r"\s*\n\s*")
+
+
 def safe_filename(name: str) -> str:
-    name = re.sub(r"[\t\n\r]", " ", name).strip()
-    name = re.sub(r"[\\/:*?\"<>|]", "_", name)
-    name = re.sub(r"\s+", " ", name)
+    name = name.translate(_FN_TRANS).strip()
+    name = _FN_WS.sub(" ", name)
     return name[:150] if name else "untitled"
 
 
 def clean_text(text: str, remove_links: bool = True, strip_ads: bool = True) -> str:
     if strip_ads:
-        # Common ad markers you may extend as needed
-        ad_patterns = [
-            r"Ads by\s+\w+",   # generic: "Ads by PubRev" etc.
-            r"Sponsored\s+Content",
-        ]
-        for pat in ad_patterns:
-            text = re.sub(pat, "", text, flags=re.IGNORECASE)
+        text = _AD_RE.sub("", text)
 
     if remove_links:
         # Remove raw URLs
-        text = re.sub(r"https?://\S+", "", text)
+        text = _URL_RE.sub("", text)
 
     # Normalize whitespace
-    text = re.sub(r"\s+\n", "\n", text)
-    text = re.sub(r"\n\s+", "\n", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _WS_NL.sub("\n", text)
     text = text.strip()
     return text
 
 
+def chapter_payload(title: str, url: str, text: str, include_links: bool) -> str:
+    source = f"Source: {url}\n\n" if include_links else ""
+    return f"{title}\n\n{source}{text}\n"
+
+
+def delay_schedule(n: int, min_s: float, max_s: float) -> list:
+    """Per-chapter delays spread over [min_s, max_s] by golden-ratio jitter.
+
+    Deterministic, so pacing is reproducible when debugging site throttling.
+    """
+    span = max_s - min_s
+    return [min_s + ((i * GOLDEN_RATIO_CONJ) % 1.0) * span for i in range(1, n + 1)]
+
+
+def concat_chapters(paths, combined_path: str):
+    """Build combined.txt from the chapter files already on disk (page-cache reads)."""
+    sep = CHAPTER_SEPARATOR.replace("\n", os.linesep).encode("utf-8")  # match text-mode files
+    with open(combined_path, "wb") as out:
+        for p in paths:
+            with open(p, "rb") as src:
+                shutil.copyfileobj(src, out, COPY_BUFFER)
+            out.write(sep)
+
+
 def ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
 
@@ -101,8 +161,11 @@ class ExtractorApp:
         self.is_running = False
         self.ready_to_extract = threading.Event()
         self.thread = None
+        self._log_q = queue.Queue()
+        self._ui_q = queue.Queue()
 
         self._build_gui()
+        self._pump_ui()
 
     def _build_gui(self):
         pad = {"padx": 8, "pady": 6}
@@ -187,6 +250,8 @@ class ExtractorApp:
         self.btn_start.config(state="disabled")
         self.btn_stop.config(state="disabled")
 
+        toc_url = self.toc_url_var.get().strip()
+
         def _launch():
             try:
                 self._log_info("Launching Playwright (headful) with persistent profile…")
@@ -199,20 +264,17 @@ class ExtractorApp:
                 )
                 self.page = self.browser.new_page()
 
-                toc_url = self.toc_url_var.get().strip()
                 self._log_info(f"Opening TOC: {toc_url}")
                 self.page.goto(toc_url, wait_until="domcontentloaded")
                 self._log_info("If needed, log in or solve challenges in the browser window.")
                 self._log_info("Then click 'I'm Ready' to allow extraction.")
 
-                self.btn_ready.config(state="normal")
-                self.btn_start.config(state="disabled")
-                self.btn_stop.config(state="disabled")
+                self._set_buttons(ready="normal", start="disabled", stop="disabled")
 
             except Exception as e:
                 self._log_error(f"Failed to launch browser: {e}")
                 self._teardown_browser()
-                self.btn_launch.config(state="normal")
+                self._set_buttons(launch="normal")
 
         threading.Thread(target=_launch, daemon=True).start()
 
@@ -270,8 +332,8 @@ class ExtractorApp:
 
             # Collect chapter links from TOC
             self._log_info(f"Collecting chapter links with selector: {link_selector}")
-            links = self.page.eval_on_selector_all(link_selector, "elements => elements.map(a => a.href || a.getAttribute('href'))")
-            links = [l for l in links if l]
+            max_count = int(self.max_count_var.get() or DEFAULT_COUNT)
+            links = self.page.evaluate(LINKS_JS, [link_selector, max_count])
 
             if not links:
                 self._log_error("No links found with the given selector. Check your CSS selector and that the TOC is visible.")
@@ -279,17 +341,18 @@ class ExtractorApp:
 
             # Normalize relative URLs
             toc_url = self.toc_url_var.get().strip()
-            base = f"{urlparse(toc_url).scheme}://{urlparse(toc_url).netloc}"
-            links = [l if l.startswith("http") else urljoin(base, l) for l in links]
-
-            max_count = int(self.max_count_var.get() or DEFAULT_COUNT)
-            links = links[:max_count]
+            toc = urlparse(toc_url)
+            base = f"{toc.scheme}://{toc.netloc}"
+            links = [l if l.startswith(ABSOLUTE_PREFIXES) else urljoin(base, l) for l in links]
             self._log_info(f"Found {len(links)} chapter links. Starting extraction…")
 
             out_dir = self.output_dir_var.get().strip() or DEFAULT_OUTPUT_DIR
             ensure_dir(out_dir)
             combined_path = os.path.join(out_dir, "combined.txt")
-            combined_fp = open(combined_path, "w", encoding="utf-8")
+            chapter_paths = []
+            writer_q = queue.Queue()
+            writer = threading.Thread(target=self._write_chapters, args=(writer_q, chapter_paths), daemon=True)
+            writer.start()
 
             include_links = bool(self.include_links_var.get())
             strip_ads = bool(self.strip_ads_var.get())
@@ -297,6 +360,7 @@ class ExtractorApp:
             max_d = float(self.max_delay_var.get())
             if min_d < 0: min_d = 0
             if max_d < min_d: max_d = min_d
+            delays = delay_schedule(len(links), min_d, max_d)
 
             for idx, url in enumerate(links, start=1):
                 if not self.is_running:
@@ -305,56 +369,65 @@ class ExtractorApp:
 
                 self._log_info(f"[{idx}/{len(links)}] Opening: {url}")
                 try:
-                    self.page.goto(url, wait_until="domcontentloaded")
-                    self.page.wait_for_timeout(500)  # small settle
+                    # Start from a blank page so a late commit can't leave the
+                    # previous chapter (or the TOC) matching the content selector
+                    self.page.goto("about:blank")
+                    try:
+                        self.page.goto(url, wait_until="commit")
+                    except PWTimeout:
+                        pass  # commit may fire late; the content wait gates correctness
+                    # Attached isn't enough: some sites fill the container after DOMContentLoaded
+                    self.page.wait_for_function(HAS_TEXT_JS, arg=content_selector, polling=100)
+                    # Parsing may still be streaming the element's children
+                    self.page.wait_for_load_state("domcontentloaded")
 
                     # Extract title and content
-                    title = self.page.eval_on_selector(title_selector, "el => el.innerText")
-                    body = self.page.eval_on_selector(content_selector, "el => el.innerText")
+                    data = self.page.evaluate(EXTRACT_JS, [title_selector, content_selector])
+                    title, body = data["title"], data["body"]
 
-                    if not body:
-                        raise RuntimeError("Content not found with provided selector.")
+                    if not body or not body.strip():
+                        self._log_info(f"[SKIP] empty body {url}")
+                        continue
 
                     title = safe_filename(title or f"chapter_{idx}")
                     cleaned = clean_text(body, remove_links=not include_links, strip_ads=strip_ads)
 
-                    # Write per-chapter file
+                    # Hand the chapter to the writer thread and move on
+                    payload = chapter_payload(title, url, cleaned, include_links)
                     chapter_path = os.path.join(out_dir, f"{idx:03d} - {title}.txt")
-                    with open(chapter_path, "w", encoding="utf-8") as cfp:
-                        cfp.write(title + "\n\n")
-                        if include_links:
-                            cfp.write(f"Source: {url}\n\n")
-                        cfp.write(cleaned + "\n")
-
-                    # Append to combined
-                    combined_fp.write(title + "\n\n")
-                    if include_links:
-                        combined_fp.write(f"Source: {url}\n\n")
-                    combined_fp.write(cleaned + "\n\n" + ("-"*80) + "\n\n")
-
-                    self._log_info(f"Saved: {chapter_path}")
+                    writer_q.put((chapter_path, payload))  # written off-thread
 
                     # Respectful pacing
-                    delay = random.uniform(min_d, max_d)
+                    delay = delays[idx - 1]
                     self._log_info(f"Sleeping {delay:.2f}s…")
-                    self.page.wait_for_timeout(int(delay * 1000))
+                    time.sleep(delay)
 
                 except PWTimeout:
                     self._log_error("Timeout while loading or selecting content. Skipping.")
                 except Exception as e:
                     self._log_error(f"Error on {url}: {e}. Skipping.")
 
-            combined_fp.close()
+            writer_q.put(None)
+            writer.join()
+            concat_chapters(chapter_paths, combined_path)
             self._log_info(f"Combined file written to: {combined_path}")
 
         finally:
             self.is_running = False
-            self.btn_launch.config(state="normal")
-            self.btn_start.config(state="disabled")
-            self.btn_ready.config(state="disabled")
-            self.btn_stop.config(state="disabled")
+            self._set_buttons(launch="normal", start="disabled", ready="disabled", stop="disabled")
             self._teardown_browser()
 
+    def _write_chapters(self, writer_q: queue.Queue, chapter_paths: list):
+        """Writer thread: drains (path, payload) items until a None sentinel."""
+        while (item := writer_q.get()) is not None:
+            chapter_path, payload = item
+            try:
+                Path(chapter_path).write_text(payload, encoding="utf-8")
+                chapter_paths.append(chapter_path)
+                self._log_info(f"Saved: {chapter_path}")
+            except Exception as e:
+                self._log_error(f"Failed to write {chapter_path}: {e}")
+
     # --------------- Validation & Teardown ---------------
 
     def _validate_basic_inputs(self, launch_only=False) -> bool:
@@ -403,9 +476,32 @@ class ExtractorApp:
     # --------------- Logging ---------------
 
     def _log(self, msg: str, tag: str = "info"):
-        self.txt_log.insert("end", f"[{tag.upper()}] {msg}\n")
-        self.txt_log.see("end")
-        self.root.update_idletasks()
+        # Safe from any thread; the Tk widget is only touched by _pump_ui.
+        self._log_q.put((tag, msg))
+
+    def _set_buttons(self, **states):
+        """Queue button state changes (e.g. start="normal") for the Tk main thread."""
+        self._ui_q.put(states)
+
+    def _pump_ui(self):
+        """Main-thread tick: apply queued button states, then flush queued log lines."""
+        try:
+            while True:
+                for name, state in self._ui_q.get_nowait().items():
+                    getattr(self, f"btn_{name}").config(state=state)
+        except queue.Empty:
+            pass
+
+        msgs = []
+        try:
+            while True:
+                msgs.append(self._log_q.get_nowait())
+        except queue.Empty:
+            pass
+        if msgs:
+            self.txt_log.insert("end", "".join(f"[{t.upper()}] {m}\n" for t, m in msgs))
+            self.txt_log.see("end")
+        self.root.after(UI_PUMP_MS, self._pump_ui)
 
     def _log_info(self, msg: str):
         self._log(msg, tag="info")